@@ -24,6 +24,7 @@ from .async_queue_manager import (
     # Auto-detection and batch processing
     scrape_with_auto_detection,
     scrape_multiple_urls,
+    ScrapeResult,
     # Platform detection utilities
     detect_platform,
     is_supported_url,
@@ -96,6 +97,7 @@ __all__ = [
     # Auto-detection and batch processing
     "scrape_with_auto_detection",
     "scrape_multiple_urls",
+    "ScrapeResult",
     "scrape_with_auto_detection_sync",
     "scrape_multiple_urls_sync",
     # Platform detection
@@ -151,9 +153,9 @@ def quick_scrape(url: str, **kwargs) -> str:
     Returns:
         Markdown formatted conversation
     """
-    import asyncio
+    from .browser_pool import run_sync
 
-    return asyncio.run(scrape_with_auto_detection(url, **kwargs))
+    return run_sync(scrape_with_auto_detection(url, **kwargs))
 
 
 def quick_batch_scrape(urls: list, **kwargs) -> list:
@@ -165,11 +167,12 @@ def quick_batch_scrape(urls: list, **kwargs) -> list:
         **kwargs: Additional arguments passed to scraper
 
     Returns:
-        List of results with success/error status
+        List of result dicts with success/error status
     """
-    import asyncio
+    from .browser_pool import run_sync
 
-    return asyncio.run(scrape_multiple_urls(urls, **kwargs))
+    results = run_sync(scrape_multiple_urls(urls, **kwargs))
+    return [result.to_dict() for result in results]
 
 
 # Add convenience functions to exports
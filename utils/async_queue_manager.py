@@ -9,11 +9,19 @@ Provides:
 - Real-time status updates
 """
 import asyncio
+import atexit
 import json
+import re
+import signal
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional, Callable
 
+from .ai_downloader import Platform
+from .browser_fetch import scrape_share, scrape_claude_share
+from .browser_pool import run_sync
+
 try:
     from litequeue import LiteQueue
     from asyncio_throttle import Throttler
@@ -25,9 +33,65 @@ except ImportError:
         "⚠️ Queue features disabled. Install litequeue and asyncio-throttle for full functionality."
     )
 
+class _QueueHandle:
+    """
+    Thin wrapper around LiteQueue that owns the SQLite handle lifecycle.
+
+    Enables WAL journaling with relaxed sync for faster small inserts, and
+    exposes close() so the WAL file is checkpointed and the connection shut
+    down cleanly at process exit instead of leaking the handle.
+    """
+
+    def __init__(self, db_path: str, queue_name: str):
+        self._queue = LiteQueue(db_path, queue_name=queue_name)
+        self._closed = False
+        try:
+            self._queue.conn.execute("PRAGMA journal_mode=WAL")
+            self._queue.conn.execute("PRAGMA synchronous=NORMAL")
+        except Exception:
+            pass  # Pragmas are best-effort; the queue still works without them
+
+    def put(self, data):
+        return self._queue.put(data)
+
+    def pop(self):
+        return self._queue.pop()
+
+    def done(self, message_id):
+        return self._queue.done(message_id)
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def close(self):
+        """Checkpoint the WAL and close the SQLite connection (idempotent)."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._queue.conn.close()
+        except Exception:
+            pass  # Nothing useful to do if shutdown cleanup fails
+
+
 # Global queue and session management
 if QUEUE_AVAILABLE:
-    task_queue = LiteQueue("scraping_queue.db", queue_name="claude_scraping")
+    task_queue = _QueueHandle("scraping_queue.db", queue_name="claude_scraping")
+    atexit.register(task_queue.close)
+
+    def _handle_sigterm(signum, frame):
+        task_queue.close()
+        if callable(_prev_sigterm):
+            _prev_sigterm(signum, frame)
+        else:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.raise_signal(signal.SIGTERM)
+
+    try:
+        _prev_sigterm = signal.signal(signal.SIGTERM, _handle_sigterm)
+    except ValueError:
+        _prev_sigterm = None  # Not in the main thread; atexit still covers us
 else:
     task_queue = None
 
@@ -35,6 +99,35 @@ active_sessions = {}  # Track active scraping sessions
 processed_tasks = {}  # Track processed tasks
 MAX_CONCURRENT_SESSIONS = 3
 
+# Precompiled URL classification - one regex pass instead of repeated substring scans
+_PLATFORM_RE = re.compile(r"https://(?:(chatgpt\.com|chat\.openai\.com)|(claude\.ai))/")
+
+# Scraper dispatch keyed by Platform value (the same strings stored in task_data)
+_SCRAPER_DISPATCH = {
+    Platform.CLAUDE.value: scrape_claude_share,
+    Platform.CHATGPT.value: scrape_share,
+}
+
+
+def _classify(url: str) -> Optional[Platform]:
+    """
+    Classify a share URL as a supported Platform in a single regex pass.
+
+    Args:
+        url: URL to classify
+
+    Returns:
+        Platform enum value or None if not recognized
+    """
+    if not url:
+        return None
+
+    match = _PLATFORM_RE.search(url)
+    if not match:
+        return None
+
+    return Platform.CHATGPT if match.group(1) else Platform.CLAUDE
+
 
 class ScrapingSession:
     """Manages individual scraping sessions with status tracking."""
@@ -90,14 +183,12 @@ async def add_to_queue(
 
     task_id = str(uuid.uuid4())
 
-    # Auto-detect scraper type if needed
+    # Auto-detect scraper type if needed (single classification, stored once)
     if scraper_type == "auto":
-        if "claude.ai/share/" in url:
-            scraper_type = "claude"
-        elif any(domain in url for domain in ["chat.openai.com", "chatgpt.com"]):
-            scraper_type = "chatgpt"
-        else:
+        platform = _classify(url)
+        if platform is None:
             raise Exception("Could not auto-detect scraper type from URL")
+        scraper_type = platform.value
 
     task_data = {
         "task_id": task_id,
@@ -120,6 +211,10 @@ async def add_to_queue(
     return task_id
 
 
+def _noop_status(_msg: str) -> None:
+    """No-op status sink used by the silent process_queue_task variant."""
+
+
 async def process_queue_task(
     status_callback: Optional[Callable[[str], None]] = None,
 ) -> Optional[Dict]:
@@ -132,6 +227,15 @@ async def process_queue_task(
     Returns:
         Task result or None if queue is empty
     """
+    # Dispatch to a fixed-shape variant so the hot body never re-tests
+    # "if status_callback:" - the silent path just calls a no-op.
+    return await _process_queue_task_impl(status_callback or _noop_status)
+
+
+async def _process_queue_task_impl(
+    _cb: Callable[[str], None],
+) -> Optional[Dict]:
+    """Shared task-processing body parameterized by an unconditional callback."""
     if not QUEUE_AVAILABLE:
         raise Exception("Queue functionality not available.")
 
@@ -155,33 +259,21 @@ async def process_queue_task(
             "url": task["url"],
         }
 
-        if status_callback:
-            status_callback(f"🚀 Processing task {task_id[:8]}...")
-
-        # Execute scraping based on type
-        if task["scraper_type"] == "claude":
-            from .browser_fetch import scrape_claude_share
-
-            result = await scrape_claude_share(
-                task["url"],
-                task["include_direction"],
-                task["include_speakers"],
-                direction_method=task["direction_method"],
-                status_callback=status_callback,
-            )
-        elif task["scraper_type"] == "chatgpt":
-            from .browser_fetch import scrape_share
-
-            result = await scrape_share(
-                task["url"],
-                task["include_direction"],
-                task["include_speakers"],
-                direction_method=task["direction_method"],
-                status_callback=status_callback,
-            )
-        else:
+        _cb(f"🚀 Processing task {task_id[:8]}...")
+
+        # Execute scraping based on type - single dict dispatch instead of elif chain
+        scraper = _SCRAPER_DISPATCH.get(task["scraper_type"])
+        if scraper is None:
             raise Exception(f"Unknown scraper type: {task['scraper_type']}")
 
+        result = await scraper(
+            task["url"],
+            task["include_direction"],
+            task["include_speakers"],
+            direction_method=task["direction_method"],
+            status_callback=_cb,
+        )
+
         # Mark task as done in the queue
         await asyncio.get_event_loop().run_in_executor(
             None, task_queue.done, task_message.message_id
@@ -199,8 +291,7 @@ async def process_queue_task(
         if task_id in active_sessions:
             del active_sessions[task_id]
 
-        if status_callback:
-            status_callback(f"✅ Task {task_id[:8]} completed successfully!")
+        _cb(f"✅ Task {task_id[:8]} completed successfully!")
 
         return {
             "task_id": task_id,
@@ -222,8 +313,7 @@ async def process_queue_task(
         if task_id in active_sessions:
             del active_sessions[task_id]
 
-        if status_callback:
-            status_callback(f"❌ Task {task_id[:8]} failed: {str(e)}")
+        _cb(f"❌ Task {task_id[:8]} failed: {str(e)}")
 
         return {
             "task_id": task_id,
@@ -334,37 +424,44 @@ async def scrape_with_auto_detection(
     if status_callback:
         status_callback("🔍 Auto-detecting platform...")
 
-    if "claude.ai/share/" in url:
-        if status_callback:
-            status_callback("🟡 Detected Claude share link")
-        from .browser_fetch import scrape_claude_share
-
-        return await scrape_claude_share(
-            url,
-            include_direction,
-            include_speakers,
-            direction_method=direction_method,
-            status_callback=status_callback,
-        )
-    elif any(domain in url for domain in ["chat.openai.com", "chatgpt.com"]):
-        if status_callback:
-            status_callback("🟢 Detected ChatGPT share link")
-        from .browser_fetch import scrape_share
-
-        return await scrape_share(
-            url,
-            include_direction,
-            include_speakers,
-            direction_method=direction_method,
-            status_callback=status_callback,
-        )
-    else:
+    platform = _classify(url)
+    if platform is None:
         raise Exception(
             "Could not detect platform from URL. Please ensure it's a valid ChatGPT or Claude share link."
         )
 
+    if status_callback:
+        if platform == Platform.CLAUDE:
+            status_callback("🟡 Detected Claude share link")
+        else:
+            status_callback("🟢 Detected ChatGPT share link")
+
+    return await _SCRAPER_DISPATCH[platform.value](
+        url,
+        include_direction,
+        include_speakers,
+        direction_method=direction_method,
+        status_callback=status_callback,
+    )
+
 
 # Batch processing functions
+@dataclass(slots=True)
+class ScrapeResult:
+    """Result of scraping a single URL in a batch (slotted to keep batches lean)."""
+
+    url: str
+    success: bool
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """Convert to the legacy dict shape for backward compatibility."""
+        if self.success:
+            return {"url": self.url, "success": True, "result": self.result}
+        return {"url": self.url, "success": False, "error": self.error}
+
+
 async def scrape_multiple_urls(
     urls: List[str],
     max_concurrent: int = 3,
@@ -372,7 +469,7 @@ async def scrape_multiple_urls(
     include_speakers: bool = True,
     direction_method: str = "auto",
     status_callback: Optional[Callable[[str], None]] = None,
-) -> List[Dict]:
+) -> List[ScrapeResult]:
     """
     Scrape multiple URLs concurrently with rate limiting.
 
@@ -385,7 +482,7 @@ async def scrape_multiple_urls(
         status_callback: Optional callback for status updates
 
     Returns:
-        List of results with success/error status
+        List of ScrapeResult entries in the original URL order
     """
     if not urls:
         return []
@@ -396,7 +493,7 @@ async def scrape_multiple_urls(
     # Create semaphore for concurrency control
     semaphore = asyncio.Semaphore(max_concurrent)
 
-    async def scrape_single_url(url: str, index: int) -> Dict:
+    async def scrape_single_url(url: str, index: int) -> ScrapeResult:
         async with semaphore:
             try:
                 if status_callback:
@@ -412,46 +509,29 @@ async def scrape_multiple_urls(
                     status_callback,
                 )
 
-                return {
-                    "url": url,
-                    "success": True,
-                    "result": result,
-                    "index": index,
-                }
+                return ScrapeResult(url=url, success=True, result=result)
             except Exception as e:
                 if status_callback:
                     status_callback(f"❌ Failed URL {index + 1}: {str(e)}")
 
-                return {
-                    "url": url,
-                    "success": False,
-                    "error": str(e),
-                    "index": index,
-                }
+                return ScrapeResult(url=url, success=False, error=str(e))
 
-    # Execute all scraping tasks concurrently
+    # Execute all scraping tasks concurrently; gather preserves input order,
+    # so results land in URL order without an explicit index field or sort
     tasks = [scrape_single_url(url, i) for i, url in enumerate(urls)]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Handle any exceptions that weren't caught
-    processed_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            processed_results.append(
-                {
-                    "url": urls[i],
-                    "success": False,
-                    "error": str(result),
-                    "index": i,
-                }
-            )
-        else:
-            processed_results.append(result)
-
-    # Sort results by original index
-    processed_results.sort(key=lambda x: x["index"])
+    processed_results = [
+        (
+            ScrapeResult(url=urls[i], success=False, error=str(result))
+            if isinstance(result, Exception)
+            else result
+        )
+        for i, result in enumerate(results)
+    ]
 
-    success_count = sum(1 for r in processed_results if r["success"])
+    success_count = sum(1 for r in processed_results if r.success)
     if status_callback:
         status_callback(
             f"🎉 Batch scraping completed: {success_count}/{len(urls)} successful"
@@ -471,15 +551,8 @@ def detect_platform(url: str) -> Optional[str]:
     Returns:
         "claude", "chatgpt", or None if not recognized
     """
-    if not url:
-        return None
-
-    if "claude.ai/share/" in url:
-        return "claude"
-    elif any(domain in url for domain in ["chat.openai.com", "chatgpt.com"]):
-        return "chatgpt"
-
-    return None
+    platform = _classify(url)
+    return platform.value if platform else None
 
 
 def is_supported_url(url: str) -> bool:
@@ -553,7 +626,7 @@ def scrape_with_auto_detection_sync(*args, **kwargs):
         "scrape_with_auto_detection_sync is deprecated. Use async version instead.",
         DeprecationWarning,
     )
-    return asyncio.run(scrape_with_auto_detection(*args, **kwargs))
+    return run_sync(scrape_with_auto_detection(*args, **kwargs))
 
 
 def scrape_multiple_urls_sync(*args, **kwargs):
@@ -564,4 +637,6 @@ def scrape_multiple_urls_sync(*args, **kwargs):
         "scrape_multiple_urls_sync is deprecated. Use async version instead.",
         DeprecationWarning,
     )
-    return asyncio.run(scrape_multiple_urls(*args, **kwargs))
+    results = run_sync(scrape_multiple_urls(*args, **kwargs))
+    # Legacy callers expect plain dicts
+    return [result.to_dict() for result in results]
@@ -0,0 +1,71 @@
+# browser_pool.py
+"""
+Process-wide event loop for the synchronous scraping entry points.
+
+The legacy *_sync wrappers used to call asyncio.run(), which spins up a
+fresh event loop per call and forces the browser pool in browser_fetch to
+discard its warm Chromium instances (the pool is bound to one loop). A
+single background loop thread keeps the pool - and therefore the launched
+browsers - alive across successive synchronous calls, so repeat downloads
+skip the multi-second browser cold start.
+"""
+import asyncio
+import atexit
+import threading
+
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+
+def _ensure_loop():
+    """Start the shared background event loop on first use."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is not None and _loop.is_running():
+            return _loop
+        _loop = asyncio.new_event_loop()
+        _loop_thread = threading.Thread(
+            target=_loop.run_forever, name="browser-pool-loop", daemon=True
+        )
+        _loop_thread.start()
+        return _loop
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on the shared loop and block until it completes.
+
+    Args:
+        coro: Coroutine object to execute
+
+    Returns:
+        Whatever the coroutine returns
+
+    Raises:
+        Whatever the coroutine raises
+    """
+    loop = _ensure_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _shutdown():
+    """Close pooled browsers and stop the background loop at interpreter exit."""
+    if _loop is None or not _loop.is_running():
+        return
+    try:
+        from .browser_fetch import _pool
+
+        asyncio.run_coroutine_threadsafe(_pool.close(), _loop).result(timeout=10)
+    except Exception:
+        pass  # Best-effort cleanup; the daemon thread dies with the process
+    try:
+        from .claude_stealth_scraper import POOL
+
+        asyncio.run_coroutine_threadsafe(POOL.close(), _loop).result(timeout=10)
+    except Exception:
+        pass  # Same best-effort deal for the stealth scraper's pool
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+atexit.register(_shutdown)
@@ -8,6 +8,12 @@ with enhanced RTL/LTR detection for Persian/Farsi, Arabic, and other RTL languag
 from pathlib import Path
 from .browser_fetch import scrape_share_sync
 
+# Accepted share-link prefixes; str.startswith takes the tuple directly
+_VALID_CHATGPT_PREFIXES = (
+    "https://chatgpt.com/share/",
+    "https://chat.openai.com/share/",
+)
+
 
 def download(
     link: str,
@@ -66,9 +72,4 @@ def is_valid_chatgpt_url(url: str) -> bool:
     Returns:
         True if valid ChatGPT share URL, False otherwise
     """
-    if not url:
-        return False
-
-    valid_prefixes = ["https://chatgpt.com/share/", "https://chat.openai.com/share/"]
-
-    return any(url.startswith(prefix) for prefix in valid_prefixes)
+    return bool(url) and url.startswith(_VALID_CHATGPT_PREFIXES)
@@ -10,15 +10,38 @@ Implements cutting-edge techniques to bypass Claude's security measures:
 """
 
 import asyncio
-from playwright.async_api import (
-    async_playwright,
-    TimeoutError as PlaywrightTimeoutError,
-)
-from bs4 import BeautifulSoup
+import hashlib
+import io
+import os
+import string
 import time
 import random
 import unicodedata
 import re
+from functools import lru_cache
+
+from .browser_pool import run_sync
+
+try:
+    import lxml  # noqa: F401  (used as the bs4 parser backend)
+
+    _BS_PARSER = "lxml"
+except ImportError:
+    _BS_PARSER = "html.parser"
+
+try:
+    import numpy as _np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from playwright_stealth import stealth_async
+
+    STEALTH_PLUGIN_AVAILABLE = True
+except ImportError:
+    STEALTH_PLUGIN_AVAILABLE = False
 
 # Enhanced Anti-Bot Configuration
 REALISTIC_USER_AGENTS = [
@@ -56,9 +79,155 @@ LANGUAGE_OPTIONS = [
     "en-US,en;q=0.9,es;q=0.8",
 ]
 
+# Anti-detection launch flags, shared by every pooled Chromium instance
+BROWSER_LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-web-security",
+    "--disable-features=VizDisplayCompositor",
+    "--disable-extensions",
+    "--no-first-run",
+    "--disable-default-apps",
+    "--disable-component-updates",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-ipc-flooding-protection",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--disable-hang-monitor",
+    "--disable-prompt-on-repost",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--disable-domain-reliability",
+    "--no-pings",
+    "--disable-client-side-phishing-detection",
+    "--disable-component-update",
+    "--disable-features=AudioServiceOutOfProcess,TranslateUI",
+    "--disable-features=OptimizationHints",
+    "--enable-features=NetworkService,NetworkServiceLogging",
+    "--force-color-profile=srgb",
+    "--use-gl=desktop",
+]
 
-def generate_realistic_fingerprint():
-    """Generate a realistic browser fingerprint to evade detection."""
+POOL_SIZE = 4
+MAX_USES_PER_INSTANCE = 50
+
+
+class BrowserPool:
+    """
+    Pool of warm Chromium instances shared by the advanced scraper.
+
+    Launching Chromium costs seconds while creating a BrowserContext on a
+    running instance costs milliseconds, so the pool keeps up to POOL_SIZE
+    browsers (and the single Playwright driver) alive across scrapes.
+    acquire() hands out an exclusive browser, launching lazily when none
+    are idle; release() returns it, closing instances that went bad, got
+    flagged by the caller, or already served MAX_USES_PER_INSTANCE scrapes
+    so long-lived processes keep rotating onto fresh browsers.
+
+    The pool binds to the event loop it is first used on. If a different
+    loop shows up (e.g. successive asyncio.run calls), the stale handles
+    are dropped and the pool restarts lazily.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_uses=MAX_USES_PER_INSTANCE):
+        self._size = size
+        self._max_uses = max_uses
+        self._playwright = None
+        self._idle = []
+        self._uses = {}
+        self._loop = None
+        self._lock = None
+        self._semaphore = None
+
+    def _bind_loop(self):
+        """(Re)initialize loop-bound primitives when the event loop changes."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._playwright = None
+            self._idle = []
+            self._uses = {}
+            self._lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self._size)
+
+    async def playwright(self):
+        """Shared started Playwright driver, bound to the current loop."""
+        from playwright.async_api import async_playwright
+
+        self._bind_loop()
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            return self._playwright
+
+    async def acquire(self):
+        """Get an exclusive browser, launching one if none are idle."""
+        from playwright.async_api import async_playwright
+
+        self._bind_loop()
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                while self._idle:
+                    browser = self._idle.pop()
+                    if browser.is_connected():
+                        return browser
+                    self._uses.pop(id(browser), None)
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                # Headless saves ~150MB RAM and ~1s startup per instance;
+                # the stealth scripts (plus plugin, when installed) cover
+                # the detection surface a headed window used to
+                return await self._playwright.chromium.launch(
+                    headless=True,
+                    args=BROWSER_LAUNCH_ARGS,
+                )
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def release(self, browser, discard=False):
+        """Return a browser to the pool (or close it if it went bad/stale)."""
+        uses = self._uses.get(id(browser), 0) + 1
+        try:
+            if discard or uses >= self._max_uses or not browser.is_connected():
+                self._uses.pop(id(browser), None)
+                try:
+                    await browser.close()
+                except Exception:
+                    pass  # Already gone
+            else:
+                self._uses[id(browser)] = uses
+                self._idle.append(browser)
+        finally:
+            self._semaphore.release()
+
+    async def close(self):
+        """Close idle browsers and stop the Playwright driver."""
+        idle, self._idle = self._idle, []
+        self._uses = {}
+        for browser in idle:
+            try:
+                await browser.close()
+            except Exception:
+                pass  # Already gone
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+POOL = BrowserPool()
+
+
+def _build_fingerprint():
+    """Assemble one randomized fingerprint dict."""
     viewport = random.choice(VIEWPORT_CONFIGS)
 
     return {
@@ -84,151 +253,248 @@ def generate_realistic_fingerprint():
     }
 
 
-async def inject_stealth_scripts(page, fingerprint):
-    """Inject comprehensive stealth scripts to bypass bot detection."""
-
-    stealth_script = f"""
-    // Remove webdriver traces
-    Object.defineProperty(navigator, 'webdriver', {{
-        get: () => undefined,
-    }});
-    
-    // Remove automation indicators
-    delete window.navigator.__proto__.webdriver;
-    delete navigator.__proto__.webdriver;
-    delete navigator.webdriver;
-    
-    // Override chrome object
-    window.chrome = {{
-        runtime: {{
-            onConnect: null,
-            onMessage: null,
-        }},
-        loadTimes: function() {{}},
-        csi: function() {{}},
-        app: {{
-            isInstalled: false,
-            InstallState: {{
-                DISABLED: 'disabled',
-                INSTALLED: 'installed',
-                NOT_INSTALLED: 'not_installed'
-            }},
-            RunningState: {{
-                CANNOT_RUN: 'cannot_run',
-                READY_TO_RUN: 'ready_to_run',
-                RUNNING: 'running'
-            }}
-        }}
-    }};
-    
-    // Override permissions API
-    const originalQuery = window.navigator.permissions.query;
-    window.navigator.permissions.query = (parameters) => (
-        parameters.name === 'notifications' ?
-            Promise.resolve({{ state: Notification.permission }}) :
-            originalQuery(parameters)
-    );
-    
-    // Override plugins
-    Object.defineProperty(navigator, 'plugins', {{
-        get: () => [1, 2, 3, 4, 5].map(i => ({{
-            0: {{type: "application/x-google-chrome-pdf", suffixes: "pdf"}},
-            description: "Portable Document Format",
-            filename: "internal-pdf-viewer",
-            length: 1,
-            name: "Chrome PDF Plugin"
-        }}))
-    }});
-    
-    // Override languages
-    Object.defineProperty(navigator, 'languages', {{
-        get: () => ['{fingerprint["language"].split(",")[0]}'],
-    }});
-    
-    // Override hardware concurrency
-    Object.defineProperty(navigator, 'hardwareConcurrency', {{
-        get: () => {fingerprint["hardware_concurrency"]},
-    }});
-    
-    // Override device memory
-    Object.defineProperty(navigator, 'deviceMemory', {{
-        get: () => {fingerprint["device_memory"]},
-    }});
-    
-    // Override WebGL fingerprint
-    const getParameter = WebGLRenderingContext.prototype.getParameter;
-    WebGLRenderingContext.prototype.getParameter = function(parameter) {{
-        if (parameter === 37445) return '{fingerprint["webgl_vendor"]}';
-        if (parameter === 37446) return '{fingerprint["webgl_renderer"]}';
-        return getParameter.call(this, parameter);
-    }};
-    
-    const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
-    WebGL2RenderingContext.prototype.getParameter = function(parameter) {{
-        if (parameter === 37445) return '{fingerprint["webgl_vendor"]}';
-        if (parameter === 37446) return '{fingerprint["webgl_renderer"]}';
-        return getParameter2.call(this, parameter);
-    }};
-    
-    // Override screen properties
-    Object.defineProperty(screen, 'colorDepth', {{
-        get: () => {fingerprint["color_depth"]},
-    }});
-    
-    Object.defineProperty(screen, 'pixelDepth', {{
-        get: () => {fingerprint["color_depth"]},
-    }});
-    
-    // Override platform
-    Object.defineProperty(navigator, 'platform', {{
-        get: () => '{fingerprint["platform"]}',
-    }});
-    
-    // Override doNotTrack
-    Object.defineProperty(navigator, 'doNotTrack', {{
-        get: () => '{fingerprint["do_not_track"]}',
-    }});
-    
-    // Override Date for timezone consistency
-    const originalGetTimezoneOffset = Date.prototype.getTimezoneOffset;
-    Date.prototype.getTimezoneOffset = function() {{
-        const tz = '{fingerprint["timezone"]}';
-        const offsets = {{
-            'America/New_York': 300,
-            'America/Los_Angeles': 480,
-            'Europe/London': 0,
-            'Asia/Tokyo': -540
-        }};
-        return offsets[tz] || 0;
-    }};
-    
-    // Add realistic event listeners
-    ['mousedown', 'mouseup', 'mousemove', 'click', 'keydown', 'keyup', 'scroll'].forEach(event => {{
-        document.addEventListener(event, () => {{}}, true);
-    }});
-    
-    // Override iframe contentWindow check
-    const originalContentWindow = Object.getOwnPropertyDescriptor(HTMLIFrameElement.prototype, 'contentWindow');
-    Object.defineProperty(HTMLIFrameElement.prototype, 'contentWindow', {{
-        get: function() {{
-            return originalContentWindow.get.call(this);
-        }}
-    }});
-    
-    // Mock battery API
-    Object.defineProperty(navigator, 'getBattery', {{
-        value: () => Promise.resolve({{
-            charging: true,
-            chargingTime: 0,
-            dischargingTime: Infinity,
-            level: 1
-        }})
-    }});
-    
-    console.log('[Stealth] Anti-detection scripts loaded successfully');
+# Frozen pool of prebuilt fingerprints: picking one costs a single RNG call
+# instead of eleven plus a dict allocation per attempt, and the repeats make
+# the stealth-template cache actually hit
+_FINGERPRINT_POOL = tuple(_build_fingerprint() for _ in range(128))
+
+
+def generate_realistic_fingerprint():
+    """Generate a realistic browser fingerprint to evade detection."""
+    return _FINGERPRINT_POOL[random.randrange(len(_FINGERPRINT_POOL))]
+
+
+# The stealth payload is ~5KB of JS; only eight fingerprint values vary
+# between calls, so the constant body is compiled into a Template once at
+# import and per-fingerprint renders are memoized
+_STEALTH_TEMPLATE = string.Template(
+    """
+// Remove webdriver traces
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined,
+});
+
+// Remove automation indicators
+delete window.navigator.__proto__.webdriver;
+delete navigator.__proto__.webdriver;
+delete navigator.webdriver;
+
+// Override chrome object
+window.chrome = {
+    runtime: {
+        onConnect: null,
+        onMessage: null,
+    },
+    loadTimes: function() {},
+    csi: function() {},
+    app: {
+        isInstalled: false,
+        InstallState: {
+            DISABLED: 'disabled',
+            INSTALLED: 'installed',
+            NOT_INSTALLED: 'not_installed'
+        },
+        RunningState: {
+            CANNOT_RUN: 'cannot_run',
+            READY_TO_RUN: 'ready_to_run',
+            RUNNING: 'running'
+        }
+    }
+};
+
+// Override permissions API
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications' ?
+        Promise.resolve({ state: Notification.permission }) :
+        originalQuery(parameters)
+);
+
+// Override plugins
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [1, 2, 3, 4, 5].map(i => ({
+        0: {type: "application/x-google-chrome-pdf", suffixes: "pdf"},
+        description: "Portable Document Format",
+        filename: "internal-pdf-viewer",
+        length: 1,
+        name: "Chrome PDF Plugin"
+    }))
+});
+
+// Override languages
+Object.defineProperty(navigator, 'languages', {
+    get: () => ['$language'],
+});
+
+// Override hardware concurrency
+Object.defineProperty(navigator, 'hardwareConcurrency', {
+    get: () => $hardware_concurrency,
+});
+
+// Override device memory
+Object.defineProperty(navigator, 'deviceMemory', {
+    get: () => $device_memory,
+});
+
+// Override WebGL fingerprint
+const getParameter = WebGLRenderingContext.prototype.getParameter;
+WebGLRenderingContext.prototype.getParameter = function(parameter) {
+    if (parameter === 37445) return '$webgl_vendor';
+    if (parameter === 37446) return '$webgl_renderer';
+    return getParameter.call(this, parameter);
+};
+
+const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
+WebGL2RenderingContext.prototype.getParameter = function(parameter) {
+    if (parameter === 37445) return '$webgl_vendor';
+    if (parameter === 37446) return '$webgl_renderer';
+    return getParameter2.call(this, parameter);
+};
+
+// Override screen properties
+Object.defineProperty(screen, 'colorDepth', {
+    get: () => $color_depth,
+});
+
+Object.defineProperty(screen, 'pixelDepth', {
+    get: () => $color_depth,
+});
+
+// Override platform
+Object.defineProperty(navigator, 'platform', {
+    get: () => '$platform',
+});
+
+// Override doNotTrack
+Object.defineProperty(navigator, 'doNotTrack', {
+    get: () => '$do_not_track',
+});
+
+// Override Date for timezone consistency
+const originalGetTimezoneOffset = Date.prototype.getTimezoneOffset;
+Date.prototype.getTimezoneOffset = function() {
+    const tz = '$timezone';
+    const offsets = {
+        'America/New_York': 300,
+        'America/Los_Angeles': 480,
+        'Europe/London': 0,
+        'Asia/Tokyo': -540
+    };
+    return offsets[tz] || 0;
+};
+
+// Add realistic event listeners
+['mousedown', 'mouseup', 'mousemove', 'click', 'keydown', 'keyup', 'scroll'].forEach(event => {
+    document.addEventListener(event, () => {}, true);
+});
+
+// Override iframe contentWindow check
+const originalContentWindow = Object.getOwnPropertyDescriptor(HTMLIFrameElement.prototype, 'contentWindow');
+Object.defineProperty(HTMLIFrameElement.prototype, 'contentWindow', {
+    get: function() {
+        return originalContentWindow.get.call(this);
+    }
+});
+
+// Mock battery API
+Object.defineProperty(navigator, 'getBattery', {
+    value: () => Promise.resolve({
+        charging: true,
+        chargingTime: 0,
+        dischargingTime: Infinity,
+        level: 1
+    })
+});
+
+console.log('[Stealth] Anti-detection scripts loaded successfully');
+"""
+)
+
+
+@lru_cache(maxsize=64)
+def _render_stealth_script(
+    language,
+    hardware_concurrency,
+    device_memory,
+    webgl_vendor,
+    webgl_renderer,
+    color_depth,
+    platform,
+    do_not_track,
+    timezone,
+):
+    """Render the stealth script for one fingerprint, caching repeats."""
+    return _STEALTH_TEMPLATE.substitute(
+        language=language,
+        hardware_concurrency=hardware_concurrency,
+        device_memory=device_memory,
+        webgl_vendor=webgl_vendor,
+        webgl_renderer=webgl_renderer,
+        color_depth=color_depth,
+        platform=platform,
+        do_not_track=do_not_track,
+        timezone=timezone,
+    )
+
+
+async def inject_stealth_scripts(context, fingerprint):
     """
+    Inject comprehensive stealth scripts to bypass bot detection.
 
-    await page.add_init_script(stealth_script)
+    The script is registered on the BrowserContext, so Chromium replays it
+    on every page the context opens without re-shipping the payload over
+    CDP per page.
+    """
+    stealth_script = _render_stealth_script(
+        fingerprint["language"].split(",")[0],
+        fingerprint["hardware_concurrency"],
+        fingerprint["device_memory"],
+        fingerprint["webgl_vendor"],
+        fingerprint["webgl_renderer"],
+        fingerprint["color_depth"],
+        fingerprint["platform"],
+        fingerprint["do_not_track"],
+        fingerprint["timezone"],
+    )
+    await context.add_init_script(stealth_script)
+
+
+# Resource types and URL markers that never contribute to text extraction;
+# aborting them cuts page-load bytes and time without breaking the React app
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+_BLOCKED_URL_MARKERS = ("analytics", "sentry", "segment", "telemetry")
+
+
+async def _block_heavy_resources(context):
+    """Abort image/font/media/telemetry requests for every page in a context."""
+
+    async def handler(route):
+        request = route.request
+        if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(
+            marker in request.url for marker in _BLOCKED_URL_MARKERS
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handler)
+
+
+async def _enable_http_cache(page):
+    """
+    Force the HTTP cache on through a raw CDP session.
+
+    Playwright leaves Chromium's default cache policy alone; explicitly
+    re-enabling it means retry attempts against the same share link reuse
+    cached bundle responses instead of refetching them. The session stays
+    attached for the page's lifetime so the setting sticks.
+    """
+    try:
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.setCacheDisabled", {"cacheDisabled": False})
+    except Exception:
+        pass  # CDP tuning is opportunistic; the scrape works without it
 
 
 async def simulate_human_behavior(page, duration_ms=3000):
@@ -258,129 +524,248 @@ async def simulate_human_behavior(page, duration_ms=3000):
         await page.wait_for_timeout(random.randint(100, 800))
 
 
+# Comprehensive security indicators, hoisted so the matcher below is built
+# once at import instead of per detection call
+SECURITY_INDICATORS = [
+    "Verify you are human",
+    "security of your connection",
+    "Enable JavaScript and cookies",
+    "Cloudflare",
+    "Please enable JavaScript",
+    "Access denied",
+    "Ray ID:",
+    "cloudflare-static",
+    "cf-browser-verification",
+    "challenge-platform",
+    "checking if the site connection is secure",
+    "This process is automatic",
+    "DDoS protection by Cloudflare",
+    "Just a moment",
+    "Please turn JavaScript on",
+    "cf-ray-",
+    "__cf_bm",
+    "_cf_chl_opt",
+    "Please complete the security check",
+    "Verifying your browser",
+    "Loading...",
+    "One moment please...",
+    "Checking your browser before accessing",
+]
+
+try:
+    import ahocorasick
+
+    # All needles are matched in a single O(N) automaton pass
+    _SECURITY_AC = ahocorasick.Automaton()
+    for _indicator in SECURITY_INDICATORS:
+        _SECURITY_AC.add_word(_indicator.lower(), _indicator)
+    _SECURITY_AC.make_automaton()
+except ImportError:
+    _SECURITY_AC = None
+
+# Fallback: one case-insensitive alternation pass instead of 23 separate
+# substring scans, each over a freshly lowered copy of the page
+_SECURITY_RE = re.compile("|".join(map(re.escape, SECURITY_INDICATORS)), re.IGNORECASE)
+
+
+def _find_security_indicator(content):
+    """Return the first security indicator present in content, or None."""
+    if _SECURITY_AC is not None:
+        for _end, indicator in _SECURITY_AC.iter(content.lower()):
+            return indicator
+        return None
+    match = _SECURITY_RE.search(content)
+    return match.group(0) if match else None
+
+
+# One round-trip gathers everything challenge detection needs: the markup,
+# the visible text length, and which challenge selectors matched
+_JS_CHALLENGE_PROBE = """
+() => {
+    const selectors = [
+        "iframe[src*='captcha']",
+        "div[class*='challenge']",
+        "div[id*='cf-']",
+        ".cf-browser-verification",
+        "#challenge-form",
+    ];
+    return {
+        body: document.documentElement.outerHTML,
+        textLength: document.body ? document.body.innerText.length : 0,
+        hits: selectors.filter((s) => document.querySelector(s)),
+    };
+}
+"""
+
+
 async def detect_security_challenge(page):
     """Detect various types of security challenges."""
-    content = await page.content()
-
-    # Comprehensive security indicators
-    security_indicators = [
-        "Verify you are human",
-        "security of your connection",
-        "Enable JavaScript and cookies",
-        "Cloudflare",
-        "Please enable JavaScript",
-        "Access denied",
-        "Ray ID:",
-        "cloudflare-static",
-        "cf-browser-verification",
-        "challenge-platform",
-        "checking if the site connection is secure",
-        "This process is automatic",
-        "DDoS protection by Cloudflare",
-        "Just a moment",
-        "Please turn JavaScript on",
-        "cf-ray-",
-        "__cf_bm",
-        "_cf_chl_opt",
-        "Please complete the security check",
-        "Verifying your browser",
-        "Loading...",
-        "One moment please...",
-        "Checking your browser before accessing",
-    ]
+    # Single CDP round-trip instead of page.content() + innerText.length +
+    # one locator count per challenge selector
+    try:
+        probe = await page.evaluate(_JS_CHALLENGE_PROBE)
+    except Exception:
+        probe = {"body": await page.content(), "textLength": None, "hits": []}
 
     # Check page content
-    for indicator in security_indicators:
-        if indicator.lower() in content.lower():
-            return True, f"Security challenge detected: {indicator}"
+    indicator = _find_security_indicator(probe["body"])
+    if indicator:
+        return True, f"Security challenge detected: {indicator}"
 
     # Check for minimal content (common with challenge pages)
-    try:
-        text_length = await page.evaluate("document.body.innerText.length")
-        if text_length < 150:
-            return True, "Minimal content detected - possible challenge page"
-    except:
-        pass
+    if probe["textLength"] is not None and probe["textLength"] < 150:
+        return True, "Minimal content detected - possible challenge page"
 
     # Check for challenge-specific elements
-    try:
-        challenge_selectors = [
-            "iframe[src*='captcha']",
-            "div[class*='challenge']",
-            "div[id*='cf-']",
-            ".cf-browser-verification",
-            "#challenge-form",
-        ]
-
-        for selector in challenge_selectors:
-            elements = await page.locator(selector).count()
-            if elements > 0:
-                return True, f"Challenge element found: {selector}"
-    except:
-        pass
+    if probe["hits"]:
+        return True, f"Challenge element found: {probe['hits'][0]}"
 
     return False, "No security challenge detected"
 
 
-async def attempt_challenge_bypass(page):
-    """Attempt to automatically bypass security challenges."""
-    print("🛡️ Attempting to bypass security challenge...")
+# Verification controls worth clicking, probed inside the browser; the
+# Playwright-only :has-text() selectors became XPath text matches
+_JS_CLICK_FIRST = """
+(selectors) => {
+    for (const selector of selectors) {
+        let el = null;
+        if (selector.startsWith('//')) {
+            el = document.evaluate(
+                selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+        } else {
+            el = document.querySelector(selector);
+        }
+        if (el) {
+            el.dispatchEvent(new MouseEvent('click', { bubbles: true }));
+            return selector;
+        }
+    }
+    return null;
+}
+"""
 
-    # Wait for potential auto-redirect
-    await page.wait_for_timeout(5000)
+_BYPASS_BUTTON_SELECTORS = [
+    "//button[contains(., 'Verify')]",
+    "//button[contains(., 'Continue')]",
+    "input[type='button'][value*='verify']",
+    "//a[contains(., 'Continue')]",
+    "button[class*='verify']",
+    "#challenge-form button",
+]
 
-    # Strategy 1: Look for and click verification buttons
-    button_selectors = [
-        "button:has-text('Verify')",
-        "button:has-text('Continue')",
-        "input[type='button'][value*='verify']",
-        "a:has-text('Continue')",
-        "button[class*='verify']",
-        "#challenge-form button",
-    ]
+_BYPASS_CHECKBOX_SELECTORS = [
+    "input[type='checkbox']",
+    ".cf-turnstile input",
+    "[class*='captcha'] input[type='checkbox']",
+]
 
-    for selector in button_selectors:
-        try:
-            button = page.locator(selector)
-            if await button.count() > 0:
-                print(f"🖱️ Found button: {selector}, attempting click...")
-                await button.first.click()
-                await page.wait_for_timeout(3000)
-                break
-        except Exception as e:
-            print(f"⚠️ Button click failed for {selector}: {e}")
 
-    # Strategy 2: Look for and interact with checkboxes
-    checkbox_selectors = [
-        "input[type='checkbox']",
-        ".cf-turnstile input",
-        "[class*='captcha'] input[type='checkbox']",
-    ]
+async def attempt_challenge_bypass(page):
+    """Attempt to automatically bypass security challenges."""
+    print("🛡️ Attempting to bypass security challenge...")
 
-    for selector in checkbox_selectors:
-        try:
-            checkbox = page.locator(selector)
-            if await checkbox.count() > 0:
-                print(f"☑️ Found checkbox: {selector}, attempting interaction...")
-                await checkbox.first.click()
-                await page.wait_for_timeout(2000)
-                break
-        except Exception as e:
-            print(f"⚠️ Checkbox interaction failed for {selector}: {e}")
+    # Wait for a potential auto-redirect; pages that settle early continue
+    # immediately instead of paying the full five seconds
+    try:
+        await page.wait_for_load_state("networkidle", timeout=5000)
+    except Exception:
+        pass  # Still busy; proceed with the bypass strategies
 
-    # Strategy 3: Wait for auto-solving
+    # Strategy 1: Click the first verification button, probing every
+    # selector in one round-trip instead of a count()+click() pair each
+    try:
+        clicked = await page.evaluate(_JS_CLICK_FIRST, _BYPASS_BUTTON_SELECTORS)
+        if clicked:
+            print(f"🖱️ Clicked button: {clicked}")
+            await page.wait_for_timeout(3000)
+    except Exception as e:
+        print(f"⚠️ Button click failed: {e}")
+
+    # Strategy 2: Interact with the first challenge checkbox the same way
+    try:
+        clicked = await page.evaluate(_JS_CLICK_FIRST, _BYPASS_CHECKBOX_SELECTORS)
+        if clicked:
+            print(f"☑️ Clicked checkbox: {clicked}")
+            await page.wait_for_timeout(2000)
+    except Exception as e:
+        print(f"⚠️ Checkbox interaction failed: {e}")
+
+    # Strategy 3: Wait for auto-solving, returning the moment the challenge
+    # form disappears instead of always sleeping the full eight seconds
     print("⏳ Waiting for challenge auto-resolution...")
-    await page.wait_for_timeout(8000)
+    try:
+        await page.wait_for_function(
+            "() => !document.querySelector('#challenge-form')", timeout=8000
+        )
+    except Exception:
+        pass  # Challenge still up; the re-check below reports it
 
     # Check if challenge was bypassed
     is_challenged, _ = await detect_security_challenge(page)
     return not is_challenged
 
 
+# Walks the live DOM inside V8 and returns compact {role, content} pairs,
+# so the common case never ships megabytes of HTML over CDP for Python-side
+# parsing at all
+_JS_MESSAGE_EXTRACTOR = """
+() => {
+    const out = [];
+    document.querySelectorAll('div[data-test-render-count]').forEach((container) => {
+        const user = container.querySelector('[data-testid="user-message"]');
+        if (user && user.innerText.trim().length > 5) {
+            out.push({ role: 'user', content: user.innerText.trim() });
+            return;
+        }
+        const assistant = container.querySelector('.font-claude-message, [class*="font-claude"]');
+        if (assistant && assistant.innerText.trim().length > 5) {
+            out.push({ role: 'assistant', content: assistant.innerText.trim() });
+        }
+    });
+    return out;
+}
+"""
+
+
+def _dedup_append(messages, seen, role, text):
+    """
+    Append a message unless identical content was already captured.
+
+    The set holds the content strings themselves rather than hashes:
+    membership still costs one hash plus an equality check in C, but two
+    distinct messages can never collide the way truncated or standalone
+    hash keys could.
+    """
+    if text in seen:
+        return
+    seen.add(text)
+    messages.append({"role": role, "content": text, "is_user": role == "user"})
+
+
 async def extract_claude_messages(page):
     """Extract conversation messages from Claude page with multiple strategies."""
+    # Strategy 0: Single in-browser pass over the live DOM
+    try:
+        extracted = await page.evaluate(_JS_MESSAGE_EXTRACTOR)
+    except Exception:
+        extracted = []
+
+    if extracted:
+        print(f"⚡ In-browser extraction found {len(extracted)} messages")
+        return [
+            {
+                "role": msg["role"],
+                "content": msg["content"],
+                "is_user": msg["role"] == "user",
+            }
+            for msg in extracted
+        ]
+
+    from bs4 import BeautifulSoup
+
     content = await page.content()
-    soup = BeautifulSoup(content, "html.parser")
+    soup = BeautifulSoup(content, _BS_PARSER)
 
     messages = []
 
@@ -415,12 +800,16 @@ async def extract_claude_messages(page):
     # Strategy 2: Direct selector approach
     if not messages:
         print("🔄 Strategy 2: Direct selector extraction...")
+        seen = set()
 
         # User messages
         user_messages = soup.find_all(attrs={"data-testid": "user-message"})
         for user_msg in user_messages:
             text_content = user_msg.get_text(separator="\\n", strip=True)
             if text_content and len(text_content) > 5:
+                # Repeated user messages are legitimate; record the content
+                # for assistant dedup but always append
+                seen.add(text_content)
                 messages.append(
                     {"role": "user", "content": text_content, "is_user": True}
                 )
@@ -441,15 +830,9 @@ async def extract_claude_messages(page):
             for assistant_msg in assistant_messages:
                 text_content = assistant_msg.get_text(separator="\\n", strip=True)
                 if text_content and len(text_content) > 5:
-                    # Avoid duplicates
-                    if not any(msg["content"] == text_content for msg in messages):
-                        messages.append(
-                            {
-                                "role": "assistant",
-                                "content": text_content,
-                                "is_user": False,
-                            }
-                        )
+                    # The overlapping selectors hit the same nodes often;
+                    # set membership replaces the old O(N) scan per insert
+                    _dedup_append(messages, seen, "assistant", text_content)
 
     # Strategy 3: Intelligent content mining
     if not messages:
@@ -492,32 +875,90 @@ async def extract_claude_messages(page):
         # Remove duplicates and take best candidates
         seen_content = set()
         for msg in potential_messages[:15]:
-            content_hash = hash(msg["content"][:200])
-            if content_hash not in seen_content:
-                seen_content.add(content_hash)
-                messages.append(msg)
+            _dedup_append(messages, seen_content, msg["role"], msg["content"])
 
     return messages
 
 
+# Hebrew/Arabic blocks plus presentation forms; one C-level search decides
+# the overwhelmingly common all-LTR case without any counting
+_RTL_RE = re.compile("[\\u0590-\\u08FF\\uFB1D-\\uFDFF\\uFE70-\\uFEFF]")
+
+_RTL_BITMAP = None
+
+
+def _get_rtl_bitmap():
+    """Full-plane R/AL bidi bitmap, built once on first use."""
+    global _RTL_BITMAP
+    if _RTL_BITMAP is None:
+        bitmap = bytearray(0x110000)
+        bidirectional = unicodedata.bidirectional
+        for codepoint in range(0x110000):
+            if bidirectional(chr(codepoint)) in ("R", "AL"):
+                bitmap[codepoint] = 1
+        _RTL_BITMAP = bytes(bitmap)
+    return _RTL_BITMAP
+
+
 def apply_rtl_detection(text, method="auto"):
     """Apply RTL/LTR direction detection for Persian/Arabic text."""
     # Simplified direction detection
-    rtl_chars = 0
-    total_chars = 0
-
-    for char in text:
-        if unicodedata.bidirectional(char) in ["R", "AL"]:
-            rtl_chars += 1
-        total_chars += 1
+    if not text:
+        return "ltr"
 
-    if total_chars == 0:
+    # Most conversations contain no RTL characters at all; one C-level
+    # search settles those without building or touching the bitmap
+    if not _RTL_RE.search(text):
         return "ltr"
 
-    rtl_ratio = rtl_chars / total_chars
+    bitmap = _get_rtl_bitmap()
+    if NUMPY_AVAILABLE and len(text) >= 64:
+        # One vectorized gather over the codepoints instead of a Python
+        # loop making a C call per character
+        codepoints = _np.frombuffer(text.encode("utf-32-le"), dtype=_np.uint32)
+        table = _np.frombuffer(bitmap, dtype=_np.uint8)
+        rtl_ratio = float(table[codepoints].mean())
+    else:
+        rtl_chars = sum(map(bitmap.__getitem__, map(ord, text)))
+        rtl_ratio = rtl_chars / len(text)
+
     return "rtl" if rtl_ratio > 0.3 else "ltr"
 
 
+# Share URLs are immutable, so a successful scrape can be replayed from
+# disk and skip the browser entirely; a one-week TTL guards against Claude
+# layout changes going stale in the cache
+_CACHE_DIR = os.path.expanduser("~/.cache/claude_scraper")
+_CACHE_TTL_SECONDS = 7 * 86400
+
+
+def _cache_path(link):
+    return os.path.join(_CACHE_DIR, hashlib.sha256(link.encode()).hexdigest() + ".md")
+
+
+def _cache_get(link):
+    """Return the cached markdown for a link, or None if absent/expired."""
+    path = _cache_path(link)
+    try:
+        if time.time() - os.path.getmtime(path) < _CACHE_TTL_SECONDS:
+            with open(path, encoding="utf-8") as cached:
+                return cached.read()
+        os.remove(path)
+    except OSError:
+        pass  # Missing, unreadable, or raced - treat as a miss
+    return None
+
+
+def _cache_put(link, markdown):
+    """Best-effort write of scraped markdown into the on-disk cache."""
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        with open(_cache_path(link), "w", encoding="utf-8") as out:
+            out.write(markdown)
+    except OSError:
+        pass  # Cache is an optimization; never fail the scrape over it
+
+
 async def scrape_claude_share_advanced(
     link: str,
     include_direction: bool = True,
@@ -525,6 +966,8 @@ async def scrape_claude_share_advanced(
     timeout: int = 60000,
     direction_method: str = "auto",
     max_retries: int = 3,
+    user_data_dir: str = None,
+    force_refresh: bool = False,
 ) -> str:
     """
     Advanced Claude share scraper with comprehensive anti-bot bypass.
@@ -536,6 +979,10 @@ async def scrape_claude_share_advanced(
         timeout: Total timeout in milliseconds
         direction_method: Direction detection method
         max_retries: Maximum retry attempts
+        user_data_dir: Optional Chromium profile directory; when set, a
+            persistent context is used so HTTP and service-worker caches
+            survive between runs and repeat scrapes re-download far less
+        force_refresh: Skip the on-disk conversation cache and re-scrape
 
     Returns:
         Markdown formatted conversation
@@ -550,6 +997,15 @@ async def scrape_claude_share_advanced(
             "Invalid Claude share link. Must start with 'https://claude.ai/share/'"
         )
 
+    # Cached conversations skip the browser entirely; formatting options
+    # are part of the key so different renderings do not collide
+    cache_key = f"{link}|{include_direction}|{include_speakers}|{direction_method}"
+    if not force_refresh:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            print("📦 Returning cached conversation (force_refresh=True re-scrapes)")
+            return cached
+
     for attempt in range(max_retries):
         print(
             f"\\n🚀 Attempt {attempt + 1}/{max_retries} to scrape Claude conversation"
@@ -560,72 +1016,68 @@ async def scrape_claude_share_advanced(
             fingerprint = generate_realistic_fingerprint()
             print(f"🔧 Generated fingerprint: {fingerprint['user_agent'][:60]}...")
 
-            async with async_playwright() as p:
-                # Launch browser with anti-detection args
-                browser = await p.chromium.launch(
-                    headless=False,  # Non-headless is less detectable
-                    args=[
-                        "--no-sandbox",
-                        "--disable-setuid-sandbox",
-                        "--disable-dev-shm-usage",
-                        "--disable-blink-features=AutomationControlled",
-                        "--disable-web-security",
-                        "--disable-features=VizDisplayCompositor",
-                        "--disable-extensions",
-                        "--no-first-run",
-                        "--disable-default-apps",
-                        "--disable-component-updates",
-                        "--disable-background-timer-throttling",
-                        "--disable-renderer-backgrounding",
-                        "--disable-backgrounding-occluded-windows",
-                        "--disable-ipc-flooding-protection",
-                        "--password-store=basic",
-                        "--use-mock-keychain",
-                        "--disable-hang-monitor",
-                        "--disable-prompt-on-repost",
-                        "--disable-sync",
-                        "--metrics-recording-only",
-                        "--disable-domain-reliability",
-                        "--no-pings",
-                        "--disable-client-side-phishing-detection",
-                        "--disable-component-update",
-                        "--disable-features=AudioServiceOutOfProcess,TranslateUI",
-                        "--disable-features=OptimizationHints",
-                        "--enable-features=NetworkService,NetworkServiceLogging",
-                        "--force-color-profile=srgb",
-                        "--use-gl=desktop",
-                    ],
-                )
+            # Realistic fingerprint options shared by both context kinds
+            context_options = dict(
+                user_agent=fingerprint["user_agent"],
+                viewport=fingerprint["viewport"],
+                locale=fingerprint["language"].split(",")[0],
+                timezone_id=fingerprint["timezone"],
+                device_scale_factor=fingerprint["pixel_ratio"],
+                screen={
+                    "width": fingerprint["viewport"]["width"],
+                    "height": fingerprint["viewport"]["height"],
+                },
+                extra_http_headers={
+                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+                    "Accept-Language": fingerprint["language"],
+                    "Accept-Encoding": "gzip, deflate, br",
+                    "DNT": fingerprint["do_not_track"],
+                    "Connection": "keep-alive",
+                    "Upgrade-Insecure-Requests": "1",
+                    "Sec-Fetch-Dest": "document",
+                    "Sec-Fetch-Mode": "navigate",
+                    "Sec-Fetch-Site": "none",
+                    "Cache-Control": "max-age=0",
+                },
+            )
+
+            browser = None
+            context = None
+            discard = False
+            try:
+                if user_data_dir is not None:
+                    # Persistent profile: HTTP/service-worker caches and the
+                    # cookie jar survive across runs, so repeat scrapes skip
+                    # re-downloading the Claude JS bundle
+                    p = await POOL.playwright()
+                    context = await p.chromium.launch_persistent_context(
+                        user_data_dir,
+                        headless=True,
+                        args=BROWSER_LAUNCH_ARGS,
+                        **context_options,
+                    )
+                else:
+                    # One pooled browser per attempt; per-attempt isolation
+                    # comes from a fresh context, far cheaper than a launch
+                    browser = await POOL.acquire()
+                    context = await browser.new_context(**context_options)
 
-                # Create context with realistic fingerprint
-                context = await browser.new_context(
-                    user_agent=fingerprint["user_agent"],
-                    viewport=fingerprint["viewport"],
-                    locale=fingerprint["language"].split(",")[0],
-                    timezone_id=fingerprint["timezone"],
-                    device_scale_factor=fingerprint["pixel_ratio"],
-                    screen={
-                        "width": fingerprint["viewport"]["width"],
-                        "height": fingerprint["viewport"]["height"],
-                    },
-                    extra_http_headers={
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                        "Accept-Language": fingerprint["language"],
-                        "Accept-Encoding": "gzip, deflate, br",
-                        "DNT": fingerprint["do_not_track"],
-                        "Connection": "keep-alive",
-                        "Upgrade-Insecure-Requests": "1",
-                        "Sec-Fetch-Dest": "document",
-                        "Sec-Fetch-Mode": "navigate",
-                        "Sec-Fetch-Site": "none",
-                        "Cache-Control": "max-age=0",
-                    },
-                )
+                # Apply stealth scripts once per context; every page the
+                # context opens replays them automatically
+                await inject_stealth_scripts(context, fingerprint)
+
+                # Skip bytes that cannot contain conversation text
+                await _block_heavy_resources(context)
 
                 page = await context.new_page()
 
-                # Apply stealth scripts
-                await inject_stealth_scripts(page, fingerprint)
+                # The plugin patches canvas/AudioContext/plugin surfaces the
+                # inline script does not cover
+                if STEALTH_PLUGIN_AVAILABLE:
+                    await stealth_async(page)
+
+                # Let retries reuse cached bundle responses
+                await _enable_http_cache(page)
 
                 # Navigate with human-like timing
                 print(f"🌐 Navigating to Claude share: {link}")
@@ -656,7 +1108,9 @@ async def scrape_claude_share_advanced(
 
                     if not bypass_success:
                         print(f"❌ Challenge bypass failed on attempt {attempt + 1}")
-                        await browser.close()
+                        # A blocked browser is tainted; have the pool close
+                        # it instead of recycling it into the next attempt
+                        discard = True
                         if attempt < max_retries - 1:
                             wait_time = (2**attempt) + random.randint(1, 5)
                             print(f"⏳ Waiting {wait_time} seconds before retry...")
@@ -669,11 +1123,10 @@ async def scrape_claude_share_advanced(
                                 "3) Generating a new share link"
                             )
 
-                # Wait for content to load
+                # Wait for content to load: race every selector at once and
+                # return as soon as the first message container attaches,
+                # instead of a flat sleep plus serial 10s waits
                 print("⏳ Waiting for conversation content...")
-                await page.wait_for_timeout(5000)
-
-                # Enhanced content detection
                 content_selectors = [
                     "div[class*='font-claude-message']",
                     "[data-testid='user-message']",
@@ -682,20 +1135,33 @@ async def scrape_claude_share_advanced(
                 ]
 
                 content_detected = False
-                for selector in content_selectors:
-                    try:
-                        await page.wait_for_selector(selector, timeout=10000)
-                        print(f"✅ Content detected: {selector}")
-                        content_detected = True
-                        break
-                    except:
-                        continue
+                tasks = {
+                    asyncio.create_task(
+                        page.wait_for_selector(selector, timeout=10000)
+                    ): selector
+                    for selector in content_selectors
+                }
+                pending = set(tasks)
+                while pending and not content_detected:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        if not task.cancelled() and task.exception() is None:
+                            print(f"✅ Content detected: {tasks[task]}")
+                            content_detected = True
+                            break
+                for task in pending:
+                    task.cancel()
 
                 if not content_detected:
                     print(
                         "⚠️ No specific content selectors found, proceeding with generic detection"
                     )
-                    await page.wait_for_timeout(5000)
+                    try:
+                        await page.wait_for_load_state("networkidle", timeout=5000)
+                    except Exception:
+                        pass  # Extract from whatever has rendered
 
                 # Final human behavior before extraction
                 await simulate_human_behavior(page, 3000)
@@ -703,8 +1169,6 @@ async def scrape_claude_share_advanced(
                 # Extract messages
                 messages = await extract_claude_messages(page)
 
-                await browser.close()
-
                 if not messages:
                     print(f"❌ No messages extracted on attempt {attempt + 1}")
                     if attempt < max_retries - 1:
@@ -716,8 +1180,20 @@ async def scrape_claude_share_advanced(
 
                 print(f"✅ Successfully extracted {len(messages)} messages")
 
-                # Format as markdown
-                blocks = []
+                # Format as markdown, writing straight into one buffer
+                # instead of building every block string and re-joining
+                out = io.StringIO()
+
+                # Add metadata
+                out.write(
+                    f"# Claude Conversation\\n\\n"
+                    f"*Downloaded from: {link}*\\n"
+                    f"*Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}*\\n"
+                    f"*Extraction method: Advanced stealth scraping*\\n"
+                    f"*Messages found: {len(messages)}*\\n\\n---\\n\\n"
+                )
+
+                first = True
                 for msg in messages:
                     content_text = msg["content"]
 
@@ -730,27 +1206,28 @@ async def scrape_claude_share_advanced(
                     else:
                         formatted_content = content_text
 
+                    if not first:
+                        out.write("\\n")
+                    first = False
+
                     # Add speaker identification
                     if include_speakers:
                         speaker = "**User:**" if msg["is_user"] else "**Claude:**"
-                        block = f"{speaker}\\n\\n{formatted_content}\\n\\n---\\n"
+                        out.write(f"{speaker}\\n\\n{formatted_content}\\n\\n---\\n")
                     else:
-                        block = f"{formatted_content}\\n\\n---\\n"
-
-                    blocks.append(block)
-
-                result = "\\n".join(blocks)
-
-                # Add metadata
-                metadata = (
-                    f"# Claude Conversation\\n\\n"
-                    f"*Downloaded from: {link}*\\n"
-                    f"*Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}*\\n"
-                    f"*Extraction method: Advanced stealth scraping*\\n"
-                    f"*Messages found: {len(messages)}*\\n\\n---\\n\\n"
-                )
+                        out.write(f"{formatted_content}\\n\\n---\\n")
 
-                return metadata + result
+                result = out.getvalue()
+                _cache_put(cache_key, result)
+                return result
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass  # Context already gone
+                if browser is not None:
+                    await POOL.release(browser, discard=discard)
 
         except Exception as e:
             print(f"❌ Attempt {attempt + 1} failed: {str(e)}")
@@ -764,6 +1241,35 @@ async def scrape_claude_share_advanced(
                 )
 
 
+async def scrape_many(links, concurrency=4, **kwargs):
+    """
+    Scrape several Claude share links concurrently over the shared pool.
+
+    Contexts are ~100x cheaper than browser launches, so N concurrent
+    scrapes share the pooled Chromium processes instead of paying N cold
+    starts. Per-link failures are returned in place rather than raised so
+    one bad link cannot abort the whole batch.
+
+    Args:
+        links: List of Claude share URLs
+        concurrency: Maximum number of simultaneous scrapes
+        **kwargs: Forwarded to scrape_claude_share_advanced
+
+    Returns:
+        List of markdown strings (or Exceptions for failed links), in
+        the same order as the input links
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def scrape_one(link):
+        async with semaphore:
+            return await scrape_claude_share_advanced(link, **kwargs)
+
+    return await asyncio.gather(
+        *(scrape_one(link) for link in links), return_exceptions=True
+    )
+
+
 # Sync wrapper for compatibility
 def scrape_claude_share_enhanced(
     link: str,
@@ -774,7 +1280,7 @@ def scrape_claude_share_enhanced(
     max_retries: int = 3,
 ) -> str:
     """Synchronous wrapper for the advanced Claude scraper."""
-    return asyncio.run(
+    return run_sync(
         scrape_claude_share_advanced(
             link,
             include_direction,
@@ -784,3 +1290,19 @@ def scrape_claude_share_enhanced(
             max_retries,
         )
     )
+
+
+def scrape_claude_shares_batch(links, concurrency=4, **kwargs):
+    """
+    Synchronous wrapper around scrape_many for batch downloads.
+
+    Args:
+        links: List of Claude share URLs
+        concurrency: Maximum number of simultaneous scrapes
+        **kwargs: Forwarded to scrape_claude_share_advanced
+
+    Returns:
+        List of markdown strings (or Exceptions for failed links), in
+        the same order as the input links
+    """
+    return run_sync(scrape_many(links, concurrency=concurrency, **kwargs))